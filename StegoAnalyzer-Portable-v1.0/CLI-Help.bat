@@ -3,11 +3,14 @@ title Steganography Analyzer - CLI
 echo Steganography Analyzer - Command Line Interface
 echo ================================================
 echo.
-echo Usage: StegoAnalyzer-CLI.exe [file] [options]
+echo Usage: StegoAnalyzer-CLI.exe [file ...] [options]
 echo.
 echo Available options:
 echo   -p PASSWORD    Password for steghide
 echo   -o OUTPUT      Output JSON file
+echo   --pretty       Indent the JSON output file
+echo   --timeout-multiplier N  Scale tool timeouts by N
+echo   --save-extracted DIR  With -o, copy full extracted payloads into DIR
 echo   --gui          Launch GUI mode
 echo.
 echo Example: StegoAnalyzer-CLI.exe image.jpg -p mypassword
@@ -6,26 +6,308 @@ A comprehensive tool for steganography analysis and extraction using multiple to
 
 import os
 import sys
+import io
+import re
+import mmap
 import subprocess
 import tempfile
 import shutil
+import signal
+import hashlib
+import functools
+import threading
+import time
+import asyncio
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 import json
 import argparse
 from colorama import init, Fore, Style
 import logging
 
-# Initialize colorama for Windows
-init()
+try:
+    from fcntl import fcntl, F_SETPIPE_SZ
+except ImportError:
+    # Pipe resizing is Linux-only
+    F_SETPIPE_SZ = None
+
+try:
+    import ijson
+    JSON_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    JSON_ERRORS = (ValueError,)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Colour only output that goes to a terminal; redirected output stays plain
+COLOR = sys.stdout is not None and sys.stdout.isatty()
+if COLOR and os.name == 'nt':
+    # Initialize colorama for Windows consoles
+    init()
+CYAN = Fore.CYAN if COLOR else ""
+GREEN = Fore.GREEN if COLOR else ""
+RED = Fore.RED if COLOR else ""
+YELLOW = Fore.YELLOW if COLOR else ""
+RESET = Style.RESET_ALL if COLOR else ""
+
+# Tool output past this size moves from memory to a temp file (output is
+# cut off entirely at MAX_OUTPUT_SIZE), so concurrent runs stay off the heap
+SPOOL_MAX_SIZE = 1024 * 1024
+# Chunk size used when feeding a buffer to a tool's stdin, and the kernel
+# pipe buffer size requested on Linux (the default is 64 KiB)
+PIPE_BUFFER_SIZE = 1024 * 1024
+# Our own descriptors are non-inheritable (PEP 446), so on POSIX close_fds
+# has nothing to do; skipping it spares each child a sweep of its fd table
+CLOSE_FDS = os.name == 'nt'
+# On POSIX each tool runs in its own session (and process group), so a kill
+# also reaches helpers it started and a terminal Ctrl+C only reaches us
+NEW_SESSION = os.name != 'nt'
+# Leading bytes of the file types the format-specific tools understand
+FILE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF8', 'gif'),
+    (b'BM', 'bmp'),
+    (b'.snd', 'au'),
+    (b'P5', 'pnm'),
+    (b'P6', 'pnm'),
+)
+# Number of leading bytes read to identify a file
+SNIFF_SIZE = 32
+# Write buffer used when saving results
+JSON_BUFFER_SIZE = 1024 * 1024
+# Seconds a tool availability check stays valid before PATH is rescanned
+TOOL_CACHE_TTL = 60
+# Shortest timeout given to any tool, in seconds
+MIN_TIMEOUT = 10
+# Longest timeout given to any tool, in seconds, however large the input claims to be
+MAX_TIMEOUT = 3600
+# Slowest throughput a tool is expected to manage before it is considered hung
+TIMEOUT_BYTES_PER_SECOND = 10 * 1024 * 1024
+# zsteg -a tries every bit plane and channel order, so it is paced per pixel
+ZSTEG_PIXELS_PER_SECOND = 50_000
+# Most pixels one byte of image data can stand for (1-bit pixels under
+# deflate's best ratio of about 1032:1); header dimensions beyond this are lies
+MAX_PIXELS_PER_BYTE = 8 * 1032
+# Bytes of an extracted payload kept in the results; the rest stays on disk
+EXTRACT_PREVIEW_SIZE = 4096
+# Read size used when hashing an extracted payload
+HASH_CHUNK_SIZE = 1024 * 1024
+# Bytes of stdout (and of stderr) kept per tool run; a tool that writes
+# more is stopped, since the reports only ever show the start of it
+MAX_OUTPUT_SIZE = 4 * 1024 * 1024
+# Seconds to wait for a timed-out tool to die after it is killed
+KILL_WAIT = 5
+# Only strings at least this long are reported by the strings analysis
+MIN_STRING_LENGTH = 6
+# Number of strings kept in the strings report
+MAX_INTERESTING_STRINGS = 100
+# Runs of printable ASCII (plus tab), as strings(1) reports them
+STRING_RE = re.compile(rb'[\t\x20-\x7e]{%d,}' % MIN_STRING_LENGTH)
+# Keywords that make a string worth reporting
+INTERESTING_RE = re.compile(rb'password|flag|http|key|BEGIN |\.onion|base64', re.IGNORECASE)
+# Characters replaced when an input name becomes part of a saved file name
+# (covers what Windows rejects, such as the <> in "<stdin>")
+UNSAFE_NAME_RE = re.compile(r'[^\w.-]')
+
+def _kill_tool(transport):
+    """Kill a tool, along with its process group where tools get one"""
+    try:
+        if NEW_SESSION:
+            # The tool leads its own group, so its pid is the group id
+            os.killpg(transport.get_pid(), signal.SIGKILL)
+        else:
+            transport.kill()
+    except (ProcessLookupError, PermissionError):
+        # Already gone
+        pass
+
+class _ToolProtocol(asyncio.SubprocessProtocol):
+    """Spools a tool's stdout/stderr as it arrives and paces writes to its stdin"""
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.stdout = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.stderr = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.stdin_closed = False
+        # Set once either stream hits MAX_OUTPUT_SIZE and the tool is stopped
+        self.truncated = False
+        self.exited = loop.create_future()
+        self._loop = loop
+        self._writable = loop.create_future()
+        self._writable.set_result(None)
+        self._transport = None
+    
+    def connection_made(self, transport):
+        self._transport = transport
+    
+    def pipe_data_received(self, fd: int, data: bytes):
+        spool = self.stdout if fd == 1 else self.stderr
+        # Output still in flight when the run is torn down is dropped
+        if spool.closed or self.truncated:
+            return
+        room = MAX_OUTPUT_SIZE - spool.tell()
+        if len(data) <= room:
+            spool.write(data)
+            return
+        spool.write(data[:room])
+        self.truncated = True
+        if self._transport.get_returncode() is not None:
+            self.process_exited()
+            return
+        _kill_tool(self._transport)
+    
+    def process_exited(self):
+        # Children of a stopped tool may still hold its pipes open, so
+        # don't wait for them to close before reporting the truncated output
+        if self.truncated and not self.exited.done():
+            self.exited.set_result(None)
+    
+    def pipe_connection_lost(self, fd: int, exc: Optional[Exception]):
+        if fd == 0:
+            # The tool closed its stdin (or exited); stop feeding it
+            self.stdin_closed = True
+            self.resume_writing()
+    
+    def pause_writing(self):
+        self._writable = self._loop.create_future()
+    
+    def resume_writing(self):
+        if not self._writable.done():
+            self._writable.set_result(None)
+    
+    async def drain(self):
+        """Wait until the tool's stdin can take more data"""
+        await self._writable
+    
+    def connection_lost(self, exc: Optional[Exception]):
+        # Called once the process has exited and all of its pipes are closed
+        if not self.exited.done():
+            self.exited.set_result(None)
+    
+    def close(self):
+        self.stdout.close()
+        self.stderr.close()
+
+def _read_extracted(output_file: str) -> Dict:
+    """Preview an extracted payload, leaving the full file on disk"""
+    try:
+        f = open(output_file, 'rb')
+    except FileNotFoundError:
+        return {"extracted_content": ""}
+    
+    with f:
+        preview = f.read(EXTRACT_PREVIEW_SIZE)
+        extracted_size = os.fstat(f.fileno()).st_size
+        digest = hashlib.sha256(preview)
+        for chunk in iter(functools.partial(f.read, HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return {
+        "extracted_content": preview.decode('utf-8', errors='ignore'),
+        "extracted_size": extracted_size,
+        "extracted_sha256": digest.hexdigest(),
+        "extracted_file": output_file
+    }
+
+def _read_foremost_audit(output_dir: str) -> Dict:
+    """Read the audit file foremost leaves in its output directory"""
+    audit_file = os.path.join(output_dir, "audit.txt")
+    audit_content = ""
+    if os.path.exists(audit_file):
+        with open(audit_file, 'r', encoding='utf-8', errors='ignore') as f:
+            audit_content = f.read()
+    return {"audit": audit_content, "output_dir": output_dir}
+
+def _parse_exiftool_json(stdout) -> Dict:
+    """Pull the first record out of exiftool -j output"""
+    try:
+        if ijson is not None:
+            return next(ijson.items(stdout, 'item', use_float=True), {})
+        records = json.load(stdout)
+        return records[0] if isinstance(records, list) and records else {}
+    except JSON_ERRORS:
+        return {}
+
+class ToolSpec(NamedTuple):
+    """How to run one external tool and where its results end up"""
+    name: str
+    # Builds the command line from (input path or '-', password, output path)
+    argv: Callable[[str, str, Optional[str]], List[str]]
+    # Name of the file or directory the tool writes into the work dir
+    output: Optional[str] = None
+    output_is_dir: bool = False
+    # Result key for the tool's stdout, and an optional parser for it
+    stdout_key: str = "output"
+    parse_stdout: Optional[Callable] = None
+    # Extra result fields read back from the output file or directory
+    collect: Optional[Callable[[str], Dict]] = None
+    # File types the tool understands; None means any
+    file_types: Optional[frozenset] = None
+    # Whether the tool can read the input from stdin instead of a path
+    stdin: bool = False
+    # Whether the run time grows with image area rather than file size
+    paced_by_pixels: bool = False
+
+# The external tools, in report order
+TOOL_SPECS = {spec.name: spec for spec in (
+    ToolSpec('zsteg', lambda source, password, output: ['zsteg', '-a', source],
+             file_types=frozenset({'png', 'bmp'}), paced_by_pixels=True),
+    ToolSpec('steghide', lambda source, password, output: ['steghide', 'extract', '-sf', source,
+                                                           '-xf', output, '-p', password],
+             output="steghide_output.txt", collect=_read_extracted,
+             file_types=frozenset({'jpg', 'bmp', 'wav', 'au'})),
+    ToolSpec('outguess', lambda source, password, output: ['outguess', '-r', source, output],
+             output="outguess_output.txt", collect=_read_extracted,
+             file_types=frozenset({'jpg', 'pnm'})),
+    ToolSpec('exiftool', lambda source, password, output: ['exiftool', '-j', source],
+             stdout_key="metadata", parse_stdout=_parse_exiftool_json, stdin=True),
+    # binwalk -e prints the same signature table as a plain scan, so a
+    # single run covers both
+    ToolSpec('binwalk', lambda source, password, output: ['binwalk', '-e', '-C', output, source],
+             output="binwalk_extract", output_is_dir=True, stdout_key="signatures",
+             collect=lambda output: {"extract_dir": output}),
+    ToolSpec('foremost', lambda source, password, output: ['foremost', '-i', source, '-o', output],
+             output="foremost_output", output_is_dir=True, collect=_read_foremost_audit),
+)}
+# Every analysis, in report order: the external tools plus the built-in strings scan
+TOOLS = tuple(TOOL_SPECS) + ('strings',)
 
 class StegoAnalyzer:
     """Main steganography analyzer class"""
     
-    def __init__(self):
+    def __init__(self, temp_dir: Optional[str] = None, timeout_multiplier: float = 1.0):
         self.results = {}
-        self.temp_dir = tempfile.mkdtemp(prefix="stego_")
+        # Scales every tool timeout, for slow machines or very large inputs
+        self.timeout_multiplier = timeout_multiplier
+        # A caller-supplied temp dir is owned (and removed) by the caller; it is
+        # made absolute so tool paths do not depend on the working directory
+        self._temp_dir = os.path.abspath(temp_dir) if temp_dir else temp_dir
+        self._owns_temp_dir = temp_dir is None
+        self._temp_dir_lock = threading.Lock()
+        # (time checked, availability) from the last check_tool_availability()
+        self._tool_cache = None
         self.setup_logging()
+    
+    @property
+    def temp_dir(self) -> str:
+        """Scratch directory for tool output, created on first use"""
+        with self._temp_dir_lock:
+            if self._temp_dir is None:
+                self._temp_dir = tempfile.mkdtemp(prefix="stego_")
+            return self._temp_dir
+    
+    def _work_dir(self, file_path: str, fresh: bool = False) -> str:
+        """Per-file subdirectory of temp_dir so runs on different files never collide"""
+        key = hashlib.blake2b(os.fsencode(os.path.abspath(file_path)), digest_size=8).hexdigest()
+        work_dir = os.path.join(self.temp_dir, key)
+        if fresh:
+            # Drop leftovers from an earlier run on the same file
+            shutil.rmtree(work_dir, ignore_errors=True)
+        os.makedirs(work_dir, exist_ok=True)
+        return work_dir
         
     def setup_logging(self):
         """Setup logging configuration"""
@@ -40,7 +322,14 @@ class StegoAnalyzer:
         self.logger = logging.getLogger(__name__)
     
     def check_tool_availability(self) -> Dict[str, bool]:
-        """Check which tools are available on the system"""
+        """Check which tools are available on the system, reusing a recent answer"""
+        now = time.monotonic()
+        if self._tool_cache is not None and now - self._tool_cache[0] < TOOL_CACHE_TTL:
+            return dict(self._tool_cache[1])
+        
+        # Rescan PATH so tools installed since the last check are picked up
+        self._path_commands.cache_clear()
+        self._resolve_command.cache_clear()
         tools = {
             'zsteg': self._check_command('zsteg'),
             'steghide': self._check_command('steghide'),
@@ -48,343 +337,539 @@ class StegoAnalyzer:
             'exiftool': self._check_command('exiftool'),
             'binwalk': self._check_command('binwalk'),
             'foremost': self._check_command('foremost'),
-            'strings': self._check_command('strings')
+            'strings': True  # built in, see run_strings
         }
-        return tools
+        self._tool_cache = (now, tools)
+        return dict(tools)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _path_commands() -> Dict[str, str]:
+        """Map every command name in PATH to its path, listing each directory once"""
+        # Windows matches names case-insensitively and only with a PATHEXT extension
+        extensions = None
+        if os.name == 'nt':
+            extensions = set(os.environ.get('PATHEXT', '.COM;.EXE;.BAT;.CMD').lower().split(os.pathsep))
+        commands = {}
+        for directory in os.environ.get('PATH', os.defpath).split(os.pathsep):
+            if not directory:
+                continue
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    if extensions is not None:
+                        name, ext = os.path.splitext(name.lower())
+                        if ext not in extensions:
+                            continue
+                    # Earlier PATH directories win, as in a shell lookup
+                    commands.setdefault(name, entry.path)
+        return commands
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _resolve_command(cls, command: str) -> Optional[str]:
+        """Return the absolute path of a command in PATH, or None"""
+        path = cls._path_commands().get(command.lower() if os.name == 'nt' else command)
+        if path is not None and os.access(path, os.X_OK) and not os.path.isdir(path):
+            return os.path.abspath(path)
+        # Shadowed by a non-executable entry; let which() search the rest of PATH
+        return shutil.which(command) if path is not None else None
     
     def _check_command(self, command: str) -> bool:
         """Check if a command is available in PATH"""
-        try:
-            result = subprocess.run([command, '--version'], 
-                                  capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError):
-            try:
-                result = subprocess.run([command, '-h'], 
-                                      capture_output=True, text=True, timeout=5)
-                return result.returncode == 0
-            except:
-                return False
-    
-    def run_zsteg(self, file_path: str) -> Dict:
-        """Run zsteg analysis on image files"""
-        if not self._check_command('zsteg'):
-            return {"error": "zsteg not available"}
-        
-        try:
-            result = subprocess.run(['zsteg', '-a', file_path], 
-                                  capture_output=True, text=True, timeout=60)
-            return {
-                "tool": "zsteg",
-                "output": result.stdout,
-                "errors": result.stderr,
-                "success": result.returncode == 0
-            }
-        except subprocess.TimeoutExpired:
-            return {"error": "zsteg analysis timed out"}
-        except Exception as e:
-            return {"error": f"zsteg error: {str(e)}"}
+        return self._resolve_command(command) is not None
     
-    def run_steghide(self, file_path: str, password: str = "") -> Dict:
-        """Run steghide analysis"""
-        if not self._check_command('steghide'):
-            return {"error": "steghide not available"}
+    async def _run_command(self, cmd: List[str], timeout: int,
+                           stdout_parser: Optional[Callable] = None,
+                           input_data: Optional[bytes] = None) -> Tuple[int, Any, str, bool]:
+        """Run a command, spooling its output to temp files as it arrives
         
+        stdout is returned as text unless stdout_parser is given, in which
+        case it is called with the spooled stdout file and its result is
+        returned instead. input_data, if given, is written to stdin. The
+        last item tells whether the tool was stopped at MAX_OUTPUT_SIZE.
+        """
+        loop = asyncio.get_running_loop()
+        # An absolute executable path and no close_fds keep the spawn cheap:
+        # subprocess uses vfork() + exec() even with a new session
+        executable = self._resolve_command(cmd[0]) or cmd[0]
+        # Tools never get our stdin (a terminal, or the data already read from it)
+        stdin = subprocess.PIPE if input_data is not None else subprocess.DEVNULL
+        # stderr stays a separate pipe: it is reported on its own and stdout may be parsed
+        transport, protocol = await loop.subprocess_exec(
+            lambda: _ToolProtocol(loop), executable, *cmd[1:], stdin=stdin,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, close_fds=CLOSE_FDS,
+            start_new_session=NEW_SESSION)
+        feeder = None
         try:
-            # Try to extract with steghide
-            output_file = os.path.join(self.temp_dir, "steghide_output.txt")
-            cmd = ['steghide', 'extract', '-sf', file_path, '-xf', output_file]
-            if password:
-                cmd.extend(['-p', password])
-            else:
-                cmd.extend(['-p', ''])
+            for fd in (0, 1, 2):
+                self._widen_pipe(transport.get_pipe_transport(fd))
+            if input_data is not None:
+                feeder = loop.create_task(self._feed_stdin(transport, protocol, input_data))
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            extracted_content = ""
-            if os.path.exists(output_file):
-                with open(output_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    extracted_content = f.read()
+            try:
+                await asyncio.wait_for(asyncio.shield(protocol.exited), timeout)
+            except asyncio.TimeoutError:
+                _kill_tool(transport)
+                # Let the killed tool be reaped before reporting the timeout
+                await asyncio.wait([protocol.exited], timeout=KILL_WAIT)
+                raise subprocess.TimeoutExpired(cmd, timeout)
             
-            return {
-                "tool": "steghide",
-                "output": result.stdout,
-                "errors": result.stderr,
-                "extracted_content": extracted_content,
-                "success": result.returncode == 0
-            }
-        except Exception as e:
-            return {"error": f"steghide error: {str(e)}"}
+            protocol.stdout.seek(0)
+            if stdout_parser is not None:
+                stdout = stdout_parser(protocol.stdout)
+            else:
+                stdout = self._read_spool(protocol.stdout)
+            return (transport.get_returncode(), stdout, self._read_spool(protocol.stderr),
+                    protocol.truncated)
+        finally:
+            if feeder is not None:
+                feeder.cancel()
+            # Also stops anything the tool left running in its group
+            _kill_tool(transport)
+            transport.close()
+            protocol.close()
     
-    def run_outguess(self, file_path: str) -> Dict:
-        """Run outguess analysis"""
-        if not self._check_command('outguess'):
-            return {"error": "outguess not available"}
-        
+    @staticmethod
+    def _widen_pipe(pipe_transport):
+        """Grow a pipe's kernel buffer so large outputs need fewer reads"""
+        if pipe_transport is None or F_SETPIPE_SZ is None:
+            return
         try:
-            output_file = os.path.join(self.temp_dir, "outguess_output.txt")
-            result = subprocess.run(['outguess', '-r', file_path, output_file], 
-                                  capture_output=True, text=True, timeout=30)
-            
-            extracted_content = ""
-            if os.path.exists(output_file):
-                with open(output_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    extracted_content = f.read()
-            
-            return {
-                "tool": "outguess",
-                "output": result.stdout,
-                "errors": result.stderr,
-                "extracted_content": extracted_content,
-                "success": result.returncode == 0
-            }
-        except Exception as e:
-            return {"error": f"outguess error: {str(e)}"}
+            fcntl(pipe_transport.get_extra_info('pipe').fileno(), F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+        except OSError:
+            # Above /proc/sys/fs/pipe-max-size; keep the default size
+            pass
+        except ValueError:
+            # The tool already exited and the pipe is closed
+            pass
     
-    def run_exiftool(self, file_path: str) -> Dict:
-        """Run exiftool to extract metadata"""
-        if not self._check_command('exiftool'):
-            return {"error": "exiftool not available"}
-        
-        try:
-            result = subprocess.run(['exiftool', '-j', file_path], 
-                                  capture_output=True, text=True, timeout=30)
-            metadata = {}
-            if result.stdout:
-                try:
-                    metadata = json.loads(result.stdout)[0] if result.stdout.strip().startswith('[') else {}
-                except json.JSONDecodeError:
-                    pass
-            
-            return {
-                "tool": "exiftool",
-                "metadata": metadata,
-                "raw_output": result.stdout,
-                "errors": result.stderr,
-                "success": result.returncode == 0
-            }
-        except Exception as e:
-            return {"error": f"exiftool error: {str(e)}"}
+    @staticmethod
+    async def _feed_stdin(transport, protocol: _ToolProtocol, data: bytes):
+        """Write data to a tool's stdin in chunks; the tool may exit before reading it all"""
+        stdin = transport.get_pipe_transport(0)
+        with memoryview(data) as view:
+            for start in range(0, len(view), PIPE_BUFFER_SIZE):
+                if protocol.stdin_closed or stdin.is_closing():
+                    return
+                stdin.write(view[start:start + PIPE_BUFFER_SIZE])
+                await protocol.drain()
+        if not stdin.is_closing():
+            stdin.close()
     
-    def run_binwalk(self, file_path: str) -> Dict:
-        """Run binwalk analysis"""
-        if not self._check_command('binwalk'):
-            return {"error": "binwalk not available"}
-        
-        try:
-            # Run binwalk with extraction
-            extract_dir = os.path.join(self.temp_dir, "binwalk_extract")
-            os.makedirs(extract_dir, exist_ok=True)
-            
-            result = subprocess.run(['binwalk', '-e', '-C', extract_dir, file_path], 
-                                  capture_output=True, text=True, timeout=60)
-            
-            # Also run signature analysis
-            sig_result = subprocess.run(['binwalk', file_path], 
-                                      capture_output=True, text=True, timeout=30)
-            
-            return {
-                "tool": "binwalk",
-                "signatures": sig_result.stdout,
-                "extraction_output": result.stdout,
-                "errors": result.stderr,
-                "extract_dir": extract_dir,
-                "success": result.returncode == 0
-            }
-        except Exception as e:
-            return {"error": f"binwalk error: {str(e)}"}
+    @staticmethod
+    def _read_spool(spool) -> str:
+        """Decode the contents of a spooled output file"""
+        spool.seek(0)
+        return spool.read().decode('utf-8', errors='replace')
     
-    def run_foremost(self, file_path: str) -> Dict:
-        """Run foremost file carving"""
-        if not self._check_command('foremost'):
-            return {"error": "foremost not available"}
-        
+    async def _run_tool(self, spec: ToolSpec, file_path: str, password: str = "",
+                        data: Optional[bytes] = None, timeout: float = MIN_TIMEOUT) -> Dict:
+        """Run one external tool as described by its spec and collect its results"""
         try:
-            output_dir = os.path.join(self.temp_dir, "foremost_output")
-            os.makedirs(output_dir, exist_ok=True)
+            output = None
+            if spec.output is not None:
+                output = os.path.join(self._work_dir(file_path), spec.output)
+                if spec.output_is_dir:
+                    os.makedirs(output, exist_ok=True)
+            # Stdin-capable tools read the buffer directly instead of the spilled copy
+            input_data = data if spec.stdin else None
+            source = '-' if input_data is not None else file_path
             
-            result = subprocess.run(['foremost', '-i', file_path, '-o', output_dir], 
-                                  capture_output=True, text=True, timeout=60)
-            
-            # Read audit file
-            audit_file = os.path.join(output_dir, "audit.txt")
-            audit_content = ""
-            if os.path.exists(audit_file):
-                with open(audit_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    audit_content = f.read()
+            returncode, stdout, stderr, truncated = await self._run_command(
+                spec.argv(source, password, output), timeout=timeout,
+                stdout_parser=spec.parse_stdout, input_data=input_data)
             
             return {
-                "tool": "foremost",
-                "output": result.stdout,
-                "errors": result.stderr,
-                "audit": audit_content,
-                "output_dir": output_dir,
-                "success": result.returncode == 0
+                "tool": spec.name,
+                spec.stdout_key: stdout,
+                "errors": stderr,
+                **(spec.collect(output) if spec.collect is not None else {}),
+                "truncated": truncated,
+                # A tool stopped for writing too much still produced usable output
+                "success": returncode == 0 or truncated
             }
+        except subprocess.TimeoutExpired:
+            return {"error": f"{spec.name} analysis timed out"}
         except Exception as e:
-            return {"error": f"foremost error: {str(e)}"}
+            return {"error": f"{spec.name} error: {str(e)}"}
     
-    def run_strings(self, file_path: str) -> Dict:
-        """Run strings analysis"""
-        if not self._check_command('strings'):
-            return {"error": "strings not available"}
-        
+    async def run_strings(self, file_path: str, data: Optional[bytes] = None,
+                          file_size: Optional[int] = None) -> Dict:
+        """Extract printable strings from a file (or from data, if given)"""
         try:
-            result = subprocess.run(['strings', file_path], 
-                                  capture_output=True, text=True, timeout=30)
-            
-            # Filter interesting strings
-            lines = result.stdout.split('\n')
-            interesting_strings = []
-            for line in lines:
-                line = line.strip()
-                if len(line) > 5:  # Only keep strings longer than 5 chars
-                    interesting_strings.append(line)
+            interesting_strings, total_strings = await asyncio.to_thread(
+                self._find_strings, file_path, data, file_size)
             
             return {
                 "tool": "strings",
-                "all_strings": result.stdout,
-                "interesting_strings": interesting_strings[:100],  # Limit output
-                "total_strings": len(lines),
-                "errors": result.stderr,
-                "success": result.returncode == 0
+                "interesting_strings": interesting_strings,
+                "total_strings": total_strings,
+                "errors": "",
+                "success": True
             }
         except Exception as e:
             return {"error": f"strings error: {str(e)}"}
     
-    def analyze_file(self, file_path: str, password: str = "") -> Dict:
-        """Perform comprehensive analysis on a file"""
-        if not os.path.exists(file_path):
-            return {"error": "File not found"}
+    @classmethod
+    def _find_strings(cls, file_path: str, data: Optional[bytes] = None,
+                      file_size: Optional[int] = None) -> Tuple[List[str], int]:
+        """Find printable strings in data, or in the file mapped into memory"""
+        if data is not None:
+            return cls._scan_strings(data)
+        if file_size is None:
+            file_size = os.path.getsize(file_path)
+        if file_size == 0:
+            return [], 0
+        # Scan the mapped file in place instead of piping it through strings(1)
+        with open(file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return cls._scan_strings(mm)
+    
+    @staticmethod
+    def _scan_strings(buffer) -> Tuple[List[str], int]:
+        """Count the printable strings in buffer, keeping the first few that contain a keyword"""
+        interesting_strings = []
+        total_strings = 0
+        search = INTERESTING_RE.search
+        for match in STRING_RE.finditer(buffer):
+            total_strings += 1
+            # Search the string in place; only keyword hits are copied out
+            if len(interesting_strings) < MAX_INTERESTING_STRINGS and \
+                    search(buffer, match.start(), match.end()):
+                interesting_strings.append(match.group().decode('ascii').strip())
+        return interesting_strings, total_strings
+    
+    @staticmethod
+    def _sniff_file_type(header: bytes) -> str:
+        """Identify a file from its leading bytes"""
+        if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+            return 'wav'
+        for signature, file_type in FILE_SIGNATURES:
+            if header.startswith(signature):
+                return file_type
+        return 'unknown'
+    
+    @staticmethod
+    def _image_pixels(header: bytes, file_type: str) -> Optional[int]:
+        """Read an image's pixel count from its header, if the format is one zsteg handles"""
+        if file_type == 'png' and header[12:16] == b'IHDR':
+            width, height = int.from_bytes(header[16:20], 'big'), int.from_bytes(header[20:24], 'big')
+        elif file_type == 'bmp' and len(header) >= 26:
+            dib_size = int.from_bytes(header[14:18], 'little')
+            if dib_size == 12:
+                # OS/2 BITMAPCOREHEADER: unsigned 16-bit dimensions
+                width = int.from_bytes(header[18:20], 'little')
+                height = int.from_bytes(header[20:22], 'little')
+            elif dib_size >= 40:
+                # BITMAPINFOHEADER and later; a negative height marks a top-down bitmap
+                width = int.from_bytes(header[18:22], 'little', signed=True)
+                height = int.from_bytes(header[22:26], 'little', signed=True)
+            else:
+                return None
+        else:
+            return None
+        return abs(width * height)
+    
+    def _timeout(self, file_size: int, pixels: Optional[int] = None) -> float:
+        """Timeout for one tool run, proportional to the work it has to do"""
+        seconds = max(MIN_TIMEOUT, file_size / TIMEOUT_BYTES_PER_SECOND)
+        if pixels is not None:
+            # Dimensions come from the (untrusted) header, so bound them by the size
+            pixels = min(pixels, file_size * MAX_PIXELS_PER_BYTE)
+            seconds = max(seconds, pixels / ZSTEG_PIXELS_PER_SECOND)
+        return min(seconds, MAX_TIMEOUT) * self.timeout_multiplier
+    
+    def analyze_file(self, file_path: str, password: str = "",
+                     tools: Optional[List[str]] = None,
+                     progress_callback: Optional[Callable[[str, int, int, Dict], None]] = None) -> Dict:
+        """Perform comprehensive analysis on a file (with only the given tools, if any)
+        
+        progress_callback, if given, is called as
+        progress_callback(tool, done, total, tool_results) each time a tool finishes.
+        """
+        return asyncio.run(self._analyze_file(file_path, password, tools=tools,
+                                              progress_callback=progress_callback))
+    
+    def analyze_files(self, file_paths: List[str], password: str = "",
+                      tools: Optional[List[str]] = None) -> List[Dict]:
+        """Analyze several files in one event loop, bounding the number of concurrent tool runs"""
+        async def analyze_all():
+            limit = asyncio.Semaphore(os.cpu_count() or 1)
+            # Collect failures per file so one bad input does not cancel the others
+            return await asyncio.gather(*(self._analyze_file(file_path, password, limit, tools)
+                                          for file_path in file_paths),
+                                        return_exceptions=True)
+        return [{"file_path": file_path, "error": f"Analysis error: {str(result)}"}
+                if isinstance(result, Exception) else result
+                for file_path, result in zip(file_paths, asyncio.run(analyze_all()))]
+    
+    async def _analyze_file(self, file_path: str, password: str,
+                            limit: Optional[asyncio.Semaphore] = None,
+                            tools: Optional[List[str]] = None,
+                            progress_callback: Optional[Callable[[str, int, int, Dict], None]] = None) -> Dict:
+        """Sniff a file on disk and run the tools on it"""
+        # One stat gives both the existence check and the size
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return {"file_path": file_path, "error": "File not found"}
+        # Tools get an absolute path; results keep the name the caller gave
+        name, file_path = file_path, os.path.abspath(file_path)
         
         self.logger.info(f"Starting analysis of: {file_path}")
+        try:
+            file_type, pixels = self._sniff(file_path, st.st_mtime_ns, st.st_size)
+        except OSError as e:
+            return {"file_path": name, "error": f"Cannot read file: {str(e)}"}
+        # Nothing stays open here: the strings scan maps the file itself once it
+        # holds a slot in limit, so a large batch does not pin one fd per file
+        return await self._run_tools(name, file_path, st.st_size, file_type,
+                                     password, limit=limit, pixels=pixels, tools=tools,
+                                     progress_callback=progress_callback)
+    
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def _sniff(cls, file_path: str, mtime_ns: int, size: int) -> Tuple[str, Optional[int]]:
+        """Type and pixel count of a file, cached until the file changes"""
+        with open(file_path, 'rb') as f:
+            header = f.read(SNIFF_SIZE)
+        file_type = cls._sniff_file_type(header)
+        return file_type, cls._image_pixels(header, file_type)
+    
+    def analyze_bytes(self, data: bytes, password: str = "", name: str = "<stdin>",
+                      tools: Optional[List[str]] = None) -> Dict:
+        """Perform comprehensive analysis on an in-memory buffer
+        
+        Tools that can read stdin are fed the buffer directly; the rest share
+        a single copy written to the temp dir.
+        """
+        self.logger.info(f"Starting analysis of: {name}")
+        
+        input_path = os.path.join(self._work_dir(name, fresh=True), "input.bin")
+        available_tools = self.check_tool_availability()
+        file_type = self._sniff_file_type(data[:SNIFF_SIZE])
+        if any(available_tools.get(tool_name) and not spec.stdin and self._handles(tool_name, file_type)
+               and (tools is None or tool_name in tools)
+               for tool_name, spec in TOOL_SPECS.items()):
+            with open(input_path, 'wb') as f:
+                f.write(data)
+        
+        return asyncio.run(self._run_tools(name, input_path, len(data), file_type, password, data,
+                                           pixels=self._image_pixels(data[:SNIFF_SIZE], file_type),
+                                           tools=tools))
+    
+    @staticmethod
+    def _handles(tool: str, file_type: str) -> bool:
+        """Check whether a tool can do anything useful with a file type"""
+        file_types = TOOL_SPECS[tool].file_types if tool in TOOL_SPECS else None
+        return file_types is None or file_type in file_types
+    
+    async def _run_tools(self, name: str, file_path: str, file_size: int, file_type: str,
+                         password: str, data: Optional[bytes] = None,
+                         limit: Optional[asyncio.Semaphore] = None,
+                         pixels: Optional[int] = None,
+                         tools: Optional[List[str]] = None,
+                         progress_callback: Optional[Callable[[str, int, int, Dict], None]] = None) -> Dict:
+        """Run every applicable tool on file_path (or data, for stdin-capable tools)
         
+        tools, if given, limits the run to the named tools; progress_callback
+        is told about each tool as it finishes.
+        """
         results = {
-            "file_path": file_path,
-            "file_size": os.path.getsize(file_path),
+            "file_path": name,
+            "file_size": file_size,
+            "file_type": file_type,
             "analysis_results": {}
         }
         
+        # Start every analysis from an empty work dir
+        self._work_dir(file_path, fresh=True)
+        
         # Check available tools
         available_tools = self.check_tool_availability()
         self.logger.info(f"Available tools: {available_tools}")
         
-        # Run each available tool
-        if available_tools.get('zsteg'):
-            self.logger.info("Running zsteg analysis...")
-            results["analysis_results"]["zsteg"] = self.run_zsteg(file_path)
-        
-        if available_tools.get('steghide'):
-            self.logger.info("Running steghide analysis...")
-            results["analysis_results"]["steghide"] = self.run_steghide(file_path, password)
+        # Run each available tool concurrently; they are independent subprocesses
+        # (or in-process scans on a worker thread)
+        jobs = {}
+        for tool_name, spec in TOOL_SPECS.items():
+            timeout = self._timeout(file_size, pixels if spec.paced_by_pixels else None)
+            jobs[tool_name] = (self._run_tool, (spec, file_path, password, data, timeout))
+        jobs['strings'] = (self.run_strings, (file_path, data, file_size))
+        jobs = {tool_name: job for tool_name, job in jobs.items() if available_tools.get(tool_name)}
+        if tools is not None:
+            deselected = [tool_name for tool_name in jobs if tool_name not in tools]
+            if deselected:
+                self.logger.info(f"Skipping deselected tools: {deselected}")
+            jobs = {tool_name: job for tool_name, job in jobs.items() if tool_name in tools}
         
-        if available_tools.get('outguess'):
-            self.logger.info("Running outguess analysis...")
-            results["analysis_results"]["outguess"] = self.run_outguess(file_path)
+        # Skip tools that would only reject this type of file after a long run
+        skipped = [tool_name for tool_name in jobs if not self._handles(tool_name, file_type)]
+        if skipped:
+            self.logger.info(f"Skipping tools not applicable to {file_type} files: {skipped}")
+            for tool_name in skipped:
+                del jobs[tool_name]
         
-        if available_tools.get('exiftool'):
-            self.logger.info("Running exiftool analysis...")
-            results["analysis_results"]["exiftool"] = self.run_exiftool(file_path)
+        async def run_job(tool_name, func, args):
+            if limit is None:
+                return tool_name, await func(*args)
+            async with limit:
+                return tool_name, await func(*args)
         
-        if available_tools.get('binwalk'):
-            self.logger.info("Running binwalk analysis...")
-            results["analysis_results"]["binwalk"] = self.run_binwalk(file_path)
+        for tool_name in jobs:
+            self.logger.info(f"Running {tool_name} analysis...")
+        # Pre-seed the keys so the report layout follows jobs, not finishing order
+        analysis_results = results["analysis_results"] = dict.fromkeys(jobs)
+        pending = [run_job(tool_name, func, args) for tool_name, (func, args) in jobs.items()]
+        for done, next_done in enumerate(asyncio.as_completed(pending), 1):
+            tool_name, tool_result = await next_done
+            analysis_results[tool_name] = tool_result
+            self.logger.info(f"Finished {tool_name} analysis")
+            if progress_callback is not None:
+                progress_callback(tool_name, done, len(jobs), tool_result)
         
-        if available_tools.get('foremost'):
-            self.logger.info("Running foremost analysis...")
-            results["analysis_results"]["foremost"] = self.run_foremost(file_path)
-        
-        if available_tools.get('strings'):
-            self.logger.info("Running strings analysis...")
-            results["analysis_results"]["strings"] = self.run_strings(file_path)
-        
-        self.results[file_path] = results
+        self.results[name] = results
         return results
     
     def print_results(self, results: Dict):
         """Print analysis results in a formatted way"""
-        print(f"\n{Fore.CYAN}{'='*60}")
-        print(f"STEGANOGRAPHY ANALYSIS RESULTS")
-        print(f"{'='*60}{Style.RESET_ALL}")
+        # Format into one buffer and write it in a single call, rather than
+        # paying for a console write per line
+        out = io.StringIO()
+        
+        print(f"\n{CYAN}{'='*60}", file=out)
+        print(f"STEGANOGRAPHY ANALYSIS RESULTS", file=out)
+        print(f"{'='*60}{RESET}", file=out)
         
-        print(f"\n{Fore.YELLOW}File:{Style.RESET_ALL} {results['file_path']}")
-        print(f"{Fore.YELLOW}Size:{Style.RESET_ALL} {results['file_size']} bytes")
+        print(f"\n{YELLOW}File:{RESET} {results['file_path']}", file=out)
+        print(f"{YELLOW}Size:{RESET} {results['file_size']} bytes", file=out)
+        print(f"{YELLOW}Type:{RESET} {results.get('file_type', 'unknown')}", file=out)
         
         for tool_name, tool_results in results["analysis_results"].items():
-            print(f"\n{Fore.GREEN}[{tool_name.upper()}]{Style.RESET_ALL}")
-            print("-" * 40)
+            print(f"\n{GREEN}[{tool_name.upper()}]{RESET}", file=out)
+            print("-" * 40, file=out)
             
             if "error" in tool_results:
-                print(f"{Fore.RED}Error: {tool_results['error']}{Style.RESET_ALL}")
+                print(f"{RED}Error: {tool_results['error']}{RESET}", file=out)
                 continue
             
             if not tool_results.get("success", False):
-                print(f"{Fore.YELLOW}No results found{Style.RESET_ALL}")
+                print(f"{YELLOW}No results found{RESET}", file=out)
+            
+            if tool_results.get("truncated"):
+                print(f"{YELLOW}Output truncated; the tool was stopped after "
+                      f"{MAX_OUTPUT_SIZE // (1024 * 1024)} MB{RESET}", file=out)
             
             # Print tool-specific results
             if tool_name == "zsteg" and tool_results.get("output"):
-                print(tool_results["output"])
-            
-            elif tool_name == "steghide":
-                if tool_results.get("extracted_content"):
-                    print(f"{Fore.CYAN}Extracted content:{Style.RESET_ALL}")
-                    print(tool_results["extracted_content"][:500] + "..." if len(tool_results["extracted_content"]) > 500 else tool_results["extracted_content"])
-                else:
-                    print("No hidden content extracted")
+                print(tool_results["output"], file=out)
             
-            elif tool_name == "outguess":
-                if tool_results.get("extracted_content"):
-                    print(f"{Fore.CYAN}Extracted content:{Style.RESET_ALL}")
-                    print(tool_results["extracted_content"][:500] + "..." if len(tool_results["extracted_content"]) > 500 else tool_results["extracted_content"])
+            elif tool_name in ("steghide", "outguess"):
+                content = tool_results.get("extracted_content")
+                if content:
+                    size = tool_results.get("extracted_size", len(content))
+                    print(f"{CYAN}Extracted content ({size} bytes):{RESET}", file=out)
+                    if tool_results.get("extracted_sha256"):
+                        print(f"SHA-256: {tool_results['extracted_sha256']}", file=out)
+                    print(content[:500] + ("..." if len(content) > 500 else ""), file=out)
                 else:
-                    print("No hidden content extracted")
+                    print("No hidden content extracted", file=out)
             
             elif tool_name == "exiftool":
                 metadata = tool_results.get("metadata", {})
                 for key, value in metadata.items():
-                    print(f"{key}: {value}")
+                    print(f"{key}: {value}", file=out)
             
             elif tool_name == "binwalk":
                 if tool_results.get("signatures"):
-                    print(tool_results["signatures"])
+                    print(tool_results["signatures"], file=out)
             
             elif tool_name == "foremost":
                 if tool_results.get("audit"):
-                    print(tool_results["audit"])
+                    print(tool_results["audit"], file=out)
             
             elif tool_name == "strings":
                 interesting = tool_results.get("interesting_strings", [])
                 if interesting:
-                    print(f"Found {tool_results.get('total_strings', 0)} strings, showing first 10 interesting ones:")
+                    print(f"Found {tool_results.get('total_strings', 0)} strings, showing first 10 interesting ones:", file=out)
                     for i, string in enumerate(interesting[:10]):
-                        print(f"  {i+1}: {string}")
+                        print(f"  {i+1}: {string}", file=out)
+        
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
     
-    def save_results(self, output_file: str):
-        """Save results to JSON file"""
-        with open(output_file, 'w') as f:
-            json.dump(self.results, f, indent=2, default=str)
-        print(f"\n{Fore.GREEN}Results saved to: {output_file}{Style.RESET_ALL}")
+    def save_results(self, output_file: str, pretty: bool = False,
+                     extracted_dir: Optional[str] = None):
+        """Save results to JSON file, copying full extracted payloads to extracted_dir if given"""
+        if extracted_dir:
+            self.save_extracted(extracted_dir)
+        self.write_json(self.results, output_file, pretty)
+        print(f"\n{GREEN}Results saved to: {output_file}{RESET}")
+    
+    def save_extracted(self, extracted_dir: str) -> int:
+        """Copy every extracted payload out of temp_dir and point the results at the copies"""
+        os.makedirs(extracted_dir, exist_ok=True)
+        saved = 0
+        for name, results in self.results.items():
+            for tool_name, tool_results in results.get("analysis_results", {}).items():
+                source = (tool_results or {}).get("extracted_file")
+                if not source or not os.path.isfile(source):
+                    continue
+                # The work dir key keeps same-named files from different folders apart
+                key = os.path.basename(os.path.dirname(source))
+                safe_name = UNSAFE_NAME_RE.sub('_', os.path.basename(name))
+                target = os.path.join(extracted_dir, f"{key}_{safe_name}.{tool_name}.bin")
+                shutil.copyfile(source, target)
+                tool_results["extracted_file"] = target
+                saved += 1
+        return saved
+    
+    @staticmethod
+    def write_json(data: Any, output_file: str, pretty: bool = False):
+        """Write data to a UTF-8 JSON file, compact unless pretty is set"""
+        if orjson is not None:
+            option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if pretty else 0)
+            encoded = orjson.dumps(data, default=str, option=option)
+        else:
+            # dumps() uses the C encoder; dump() would fall back to the pure Python one
+            encoded = json.dumps(data, default=str, ensure_ascii=False,
+                                 indent=2 if pretty else None,
+                                 separators=None if pretty else (',', ':')).encode('utf-8')
+        with open(output_file, 'wb', buffering=JSON_BUFFER_SIZE) as f:
+            f.write(encoded)
     
     def cleanup(self):
         """Clean up temporary files"""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        if self._owns_temp_dir and self._temp_dir and os.path.exists(self._temp_dir):
+            shutil.rmtree(self._temp_dir)
+            self._temp_dir = None
 
 def main():
     """Main CLI interface"""
     parser = argparse.ArgumentParser(description="Steganography Analyzer - Multi-tool analysis")
-    parser.add_argument("file", help="File to analyze")
+    parser.add_argument("files", nargs="+", metavar="file",
+                        help="File(s) to analyze ('-' reads a single file from stdin)")
     parser.add_argument("-p", "--password", default="", help="Password for steghide")
     parser.add_argument("-o", "--output", help="Output JSON file for results")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output file")
+    parser.add_argument("--save-extracted", metavar="DIR",
+                        help="With -o, also copy full steghide/outguess payloads into DIR")
+    parser.add_argument("--timeout-multiplier", type=float, default=1.0,
+                        help="Scale every tool timeout by this factor (default: 1.0)")
     parser.add_argument("--gui", action="store_true", help="Launch GUI interface")
     
     args = parser.parse_args()
+    if args.save_extracted and not args.output:
+        parser.error("--save-extracted requires -o/--output")
     
     if args.gui:
         # Import and launch GUI
         try:
-            import sys
-            import os
             # Add current directory to path for executable
             if hasattr(sys, '_MEIPASS'):
                 sys.path.insert(0, sys._MEIPASS)
@@ -395,29 +880,36 @@ def main():
             app = StegoGUI()
             app.run()
         except ImportError as e:
-            print(f"{Fore.RED}GUI not available: {str(e)}{Style.RESET_ALL}")
-            print(f"{Fore.YELLOW}Make sure tkinter is installed or use the GUI executable directly.{Style.RESET_ALL}")
+            print(f"{RED}GUI not available: {str(e)}{RESET}")
+            print(f"{YELLOW}Make sure tkinter is installed or use the GUI executable directly.{RESET}")
         return
     
-    analyzer = StegoAnalyzer()
-    
-    try:
-        # Analyze the file
-        results = analyzer.analyze_file(args.file, args.password)
+    with tempfile.TemporaryDirectory(prefix="stego_") as temp_dir:
+        analyzer = StegoAnalyzer(temp_dir=temp_dir, timeout_multiplier=args.timeout_multiplier)
         
-        # Print results
-        analyzer.print_results(results)
+        try:
+            # Analyze the file(s)
+            if args.files == ['-']:
+                all_results = [analyzer.analyze_bytes(sys.stdin.buffer.read(), args.password)]
+            else:
+                all_results = analyzer.analyze_files(args.files, args.password)
+            
+            # Print results
+            for results in all_results:
+                if "error" in results:
+                    print(f"{RED}{results['file_path']}: {results['error']}{RESET}")
+                    continue
+                analyzer.print_results(results)
+            
+            # Save results if requested
+            if args.output:
+                analyzer.save_results(args.output, pretty=args.pretty,
+                                      extracted_dir=args.save_extracted)
         
-        # Save results if requested
-        if args.output:
-            analyzer.save_results(args.output)
-    
-    except KeyboardInterrupt:
-        print(f"\n{Fore.YELLOW}Analysis interrupted by user{Style.RESET_ALL}")
-    except Exception as e:
-        print(f"{Fore.RED}Error: {str(e)}{Style.RESET_ALL}")
-    finally:
-        analyzer.cleanup()
+        except KeyboardInterrupt:
+            print(f"\n{YELLOW}Analysis interrupted by user{RESET}")
+        except Exception as e:
+            print(f"{RED}Error: {str(e)}{RESET}")
 
 if __name__ == "__main__":
     main()
@@ -7,8 +7,9 @@ Tkinter-based GUI for the steganography analyzer
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
-import json
+import queue
 import os
+import stat
 import sys
 
 # Fix import path for executable
@@ -17,16 +18,18 @@ if hasattr(sys, '_MEIPASS'):
 else:
     sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from stego_analyzer import StegoAnalyzer
-except ImportError:
-    # Fallback for when running as standalone
-    import importlib.util
-    spec = importlib.util.spec_from_file_location("stego_analyzer", 
-                                                 os.path.join(os.path.dirname(__file__), "stego_analyzer.py"))
-    stego_analyzer = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(stego_analyzer)
-    StegoAnalyzer = stego_analyzer.StegoAnalyzer
+from stego_analyzer import StegoAnalyzer, TOOLS
+
+# (tool, row, column) of each tool checkbox, three to a row
+TOOL_GRID = tuple((tool, i // 3, i % 3) for i, tool in enumerate(TOOLS))
+# Milliseconds between checks for updates posted by worker threads
+UI_POLL_INTERVAL = 50
+# Minimum milliseconds between status bar updates
+STATUS_INTERVAL = 100
+# Characters of result text inserted into the widget per event-loop turn
+INSERT_CHUNK_SIZE = 64 * 1024
+# Characters of an extracted payload shown in the results panel
+CONTENT_PREVIEW_LENGTH = 500
 
 class StegoGUI:
     """GUI interface for steganography analyzer"""
@@ -35,11 +38,59 @@ class StegoGUI:
         self.root = tk.Tk()
         self.root.title("Steganography Analyzer v1.0")
         self.root.geometry("800x600")
-        self.analyzer = StegoAnalyzer()
+        # Created on a background thread so the window paints straight away
+        self.analyzer = None
+        # Set instead of analyzer if _lazy_init fails
+        self._init_error = None
         self.current_file = None
+        # Name and stat of current_file, taken once when it is selected
+        self._basename = None
+        self._stat = None
         self.results = None
+        # Per-tool results of the current run, filled in as each tool finishes
+        self._tool_results = {}
+        self._insert_job = None
+        # Latest status message not yet shown, and the timer that will show it
+        self._pending_status = None
+        self._status_timer = None
+        # (callable, args) posted by worker threads, run on the Tk thread
+        self._ui_queue = queue.Queue()
         
         self.setup_ui()
+        self.root.after(UI_POLL_INTERVAL, self._drain_ui_queue)
+        threading.Thread(target=self._lazy_init, daemon=True).start()
+    
+    def _lazy_init(self):
+        """Create the analyzer and warm its tool cache off the Tk thread"""
+        try:
+            analyzer = StegoAnalyzer()
+            analyzer.check_tool_availability()
+        except Exception as e:
+            self._ui_queue.put((self._init_failed, (str(e),)))
+            return
+        self._ui_queue.put((self._set_analyzer, (analyzer,)))
+    
+    def _set_analyzer(self, analyzer):
+        """Start using the analyzer built by _lazy_init"""
+        self.analyzer = analyzer
+        if self._status_text() == "Initializing...":
+            self._schedule_status("Ready")
+    
+    def _init_failed(self, error_msg):
+        """Tell the user the analyzer could not be created; analysis stays unavailable"""
+        self._init_error = error_msg
+        messagebox.showerror("Initialization Error", f"The analyzer could not be started:\n{error_msg}")
+        self._schedule_status("Initialization failed")
+    
+    def _analyzer_ready(self):
+        """Whether the analyzer exists, explaining in the status bar if not"""
+        if self.analyzer is not None:
+            return True
+        if self._init_error is not None:
+            self._schedule_status(f"Initialization failed: {self._init_error}")
+        else:
+            self._schedule_status("Still initializing, try again in a moment")
+        return False
         
     def setup_ui(self):
         """Setup the user interface"""
@@ -78,13 +129,11 @@ class StegoGUI:
         tools_frame.grid(row=2, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=5)
         
         self.tool_vars = {}
-        tools = ['zsteg', 'steghide', 'outguess', 'exiftool', 'binwalk', 'foremost', 'strings']
-        
-        for i, tool in enumerate(tools):
+        for tool, row, column in TOOL_GRID:
             var = tk.BooleanVar(value=True)
             self.tool_vars[tool] = var
             ttk.Checkbutton(tools_frame, text=tool, variable=var).grid(
-                row=i//3, column=i%3, sticky=tk.W, padx=5, pady=2
+                row=row, column=column, sticky=tk.W, padx=5, pady=2
             )
         
         # Control buttons
@@ -96,23 +145,37 @@ class StegoGUI:
         
         ttk.Button(button_frame, text="Clear Results", command=self.clear_results).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Save Results", command=self.save_results).pack(side=tk.LEFT, padx=5)
+        # Compact JSON is smaller and faster to write; indent only on request
+        self.pretty_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="Pretty JSON", variable=self.pretty_var).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Check Tools", command=self.check_tools).pack(side=tk.LEFT, padx=5)
         
         # Progress bar
-        self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
+        self.progress = ttk.Progressbar(main_frame, mode='determinate')
         self.progress.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
         
-        # Results area
-        results_frame = ttk.LabelFrame(main_frame, text="Analysis Results", padding="5")
+        # Results area: one row per tool, with the selected tool's output below
+        self.results_frame = results_frame = ttk.LabelFrame(main_frame, text="Analysis Results", padding="5")
         results_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
         results_frame.columnconfigure(0, weight=1)
-        results_frame.rowconfigure(0, weight=1)
-        
-        self.results_text = scrolledtext.ScrolledText(results_frame, wrap=tk.WORD, height=20)
-        self.results_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        results_frame.rowconfigure(1, weight=1)
+        
+        self.results_tree = ttk.Treeview(results_frame, columns=("status", "summary"),
+                                         height=len(TOOLS), selectmode="browse")
+        self.results_tree.heading("#0", text="Tool")
+        self.results_tree.heading("status", text="Status")
+        self.results_tree.heading("summary", text="Summary")
+        self.results_tree.column("#0", width=100, stretch=False)
+        self.results_tree.column("status", width=90, stretch=False)
+        self.results_tree.column("summary", width=400)
+        self.results_tree.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 5))
+        self.results_tree.bind("<<TreeviewSelect>>", self._on_tool_select)
+        
+        self.results_text = scrolledtext.ScrolledText(results_frame, wrap=tk.WORD, height=12)
+        self.results_text.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Status bar
-        self.status_var = tk.StringVar(value="Ready")
+        self.status_var = tk.StringVar(value="Initializing...")
         status_bar = ttk.Label(main_frame, textvariable=self.status_var, relief=tk.SUNKEN)
         status_bar.grid(row=6, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
         
@@ -130,19 +193,19 @@ class StegoGUI:
         if filename:
             self.file_var.set(filename)
             self.current_file = filename
-            self.status_var.set(f"Selected: {os.path.basename(filename)}")
+            self._basename = os.path.basename(filename)
+            try:
+                self._stat = os.stat(filename)
+            except OSError:
+                self._stat = None
+            self._schedule_status(f"Selected: {self._basename}")
     
     def check_tools(self):
         """Check which tools are available"""
-        self.status_var.set("Checking tool availability...")
-        
-        def check_thread():
-            available_tools = self.analyzer.check_tool_availability()
-            
-            # Update UI in main thread
-            self.root.after(0, lambda: self.update_tool_status(available_tools))
-        
-        threading.Thread(target=check_thread, daemon=True).start()
+        if not self._analyzer_ready():
+            return
+        # A cached lookup, or at worst one PATH scan; no thread needed
+        self.update_tool_status(self.analyzer.check_tool_availability())
     
     def update_tool_status(self, available_tools):
         """Update tool status in the UI"""
@@ -152,135 +215,296 @@ class StegoGUI:
             message += f"{tool}: {status}\n"
         
         messagebox.showinfo("Tool Status", message)
-        self.status_var.set("Tool check complete")
+        self._schedule_status("Tool check complete")
     
     def start_analysis(self):
         """Start the analysis in a separate thread"""
+        if not self._analyzer_ready():
+            return
+        
         if not self.current_file:
             messagebox.showerror("Error", "Please select a file to analyze")
             return
         
-        if not os.path.exists(self.current_file):
+        # A file deleted since it was selected is reported by the analyzer itself
+        if self._stat is None or not stat.S_ISREG(self._stat.st_mode):
             messagebox.showerror("Error", "Selected file does not exist")
             return
         
-        # Disable analyze button and start progress
+        # Tk variables may only be read on this thread, so snapshot them for the worker
+        password = self.password_var.get()
+        tools = [tool for tool, var in self.tool_vars.items() if var.get()]
+        if not tools:
+            messagebox.showerror("Error", "Please select at least one tool")
+            return
+        
+        # Disable analyze button and reset progress; the bar only moves as tools finish
         self.analyze_btn.config(state="disabled")
-        self.progress.start()
-        self.status_var.set("Analyzing file...")
+        self.progress.config(maximum=len(tools), value=0)
+        self._reset_results()
+        self.results_frame.config(text=f"Analysis Results: {self._basename}")
+        self._schedule_status("Analyzing file...")
         
         # Start analysis in separate thread
-        threading.Thread(target=self.run_analysis, daemon=True).start()
+        threading.Thread(target=self.run_analysis, args=(self.current_file, password, tools),
+                         daemon=True).start()
     
-    def run_analysis(self):
-        """Run the actual analysis"""
+    def run_analysis(self, file_path, password, tools):
+        """Run the actual analysis (unchecked tools are never started)"""
         try:
-            password = self.password_var.get()
-            results = self.analyzer.analyze_file(self.current_file, password)
+            results = self.analyzer.analyze_file(file_path, password, tools=tools,
+                                                 progress_callback=self.report_progress)
             
             # Update UI in main thread
-            self.root.after(0, lambda: self.analysis_complete(results))
+            self._ui_queue.put((self.analysis_complete, (results,)))
             
         except Exception as e:
-            self.root.after(0, lambda: self.analysis_error(str(e)))
+            self._ui_queue.put((self.analysis_error, (str(e),)))
+    
+    def report_progress(self, tool, done, total, tool_results):
+        """Called from the analysis thread each time a tool finishes"""
+        # Update UI in main thread
+        self._ui_queue.put((self.update_progress, (tool, done, total, tool_results)))
+    
+    def _drain_ui_queue(self):
+        """Run every update the worker threads have posted, then check again later"""
+        # One Tk wakeup handles however many tools finished since the last one
+        try:
+            while True:
+                try:
+                    func, args = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                func(*args)
+        finally:
+            self.root.after(UI_POLL_INTERVAL, self._drain_ui_queue)
+    
+    def _schedule_status(self, message):
+        """Show a status message, at most one update per STATUS_INTERVAL"""
+        if self._status_timer is None:
+            self.status_var.set(message)
+            self._status_timer = self.root.after(STATUS_INTERVAL, self._flush_status)
+        else:
+            # Only the newest message in the window is ever shown
+            self._pending_status = message
+    
+    def _flush_status(self):
+        """Show the message that arrived while the last one was on screen"""
+        self._status_timer = None
+        if self._pending_status is not None:
+            message, self._pending_status = self._pending_status, None
+            self._schedule_status(message)
+    
+    def _status_text(self):
+        """The status message currently shown or about to be"""
+        if self._pending_status is not None:
+            return self._pending_status
+        return self.status_var.get()
+    
+    def update_progress(self, tool, done, total, tool_results):
+        """Advance the progress bar and add the finished tool's row"""
+        # Unavailable or inapplicable tools are dropped, so total can be below the checked count
+        self.progress.config(maximum=total, value=done)
+        self._schedule_status(f"Analyzing file... {tool} done ({done}/{total})")
+        self._show_tool_row(tool, tool_results)
+        # Show the first tool to finish straight away
+        if not self.results_tree.selection():
+            self.results_tree.selection_set(tool)
+    
+    def _show_tool_row(self, tool_name, tool_results):
+        """Insert or refresh one tool's row in the results list"""
+        self._tool_results[tool_name] = tool_results
+        status, summary = self._summarize(tool_name, tool_results)
+        if self.results_tree.exists(tool_name):
+            self.results_tree.item(tool_name, values=(status, summary))
+        else:
+            self.results_tree.insert("", tk.END, iid=tool_name, text=tool_name, values=(status, summary))
     
     def analysis_complete(self, results):
         """Handle analysis completion"""
-        self.progress.stop()
+        self.progress.config(value=self.progress.cget("maximum"))
         self.analyze_btn.config(state="normal")
+        if "error" in results:
+            self.analysis_error(results["error"])
+            return
         self.results = results
         
         # Display results
         self.display_results(results)
-        self.status_var.set("Analysis complete")
+        self._schedule_status("Analysis complete")
     
     def analysis_error(self, error_msg):
         """Handle analysis error"""
-        self.progress.stop()
+        self.progress.config(value=0)
         self.analyze_btn.config(state="normal")
         messagebox.showerror("Analysis Error", f"An error occurred during analysis:\n{error_msg}")
-        self.status_var.set("Analysis failed")
+        self._schedule_status("Analysis failed")
     
     def display_results(self, results):
-        """Display analysis results in the text area"""
-        self.results_text.delete(1.0, tk.END)
-        
-        output = f"STEGANOGRAPHY ANALYSIS RESULTS\n"
-        output += f"{'='*60}\n\n"
-        output += f"File: {results['file_path']}\n"
-        output += f"Size: {results['file_size']} bytes\n\n"
+        """Finish the per-tool rows; a tool's full output is only rendered when it is selected"""
+        self.results_frame.config(
+            text=f"Analysis Results: {os.path.basename(results['file_path'])} "
+                 f"({results['file_size']} bytes, {results.get('file_type', 'unknown')})")
+        
+        # Rows were added in finishing order; settle them into the report's order
+        for index, (tool_name, tool_results) in enumerate(results["analysis_results"].items()):
+            self._show_tool_row(tool_name, tool_results)
+            self.results_tree.move(tool_name, "", index)
+        
+        rows = self.results_tree.get_children()
+        if rows and not self.results_tree.selection():
+            self.results_tree.selection_set(rows[0])
+    
+    def _on_tool_select(self, event):
+        """Show the selected tool's output in the detail panel"""
+        selection = self.results_tree.selection()
+        if not selection or selection[0] not in self._tool_results:
+            return
+        tool_name = selection[0]
+        self._show_text(self._format_tool(tool_name, self._tool_results[tool_name]))
+    
+    @staticmethod
+    def _summarize(tool_name, tool_results):
+        """One-line (status, summary) for a tool's row"""
+        if "error" in tool_results:
+            return "Error", tool_results["error"]
+        if not tool_results.get("success", False):
+            return "No results", ""
+        
+        if tool_name in ("steghide", "outguess"):
+            if tool_results.get("extracted_content"):
+                size = tool_results.get("extracted_size", len(tool_results["extracted_content"]))
+                summary = f"Extracted {size} bytes"
+            else:
+                summary = "No hidden content extracted"
+        elif tool_name == "exiftool":
+            summary = f"{len(tool_results.get('metadata') or {})} metadata fields"
+        elif tool_name == "strings":
+            summary = (f"{len(tool_results.get('interesting_strings', []))} interesting of "
+                       f"{tool_results.get('total_strings', 0)} strings")
+        else:
+            output = tool_results.get("output") or tool_results.get("signatures") or tool_results.get("audit") or ""
+            lines = output.count("\n")
+            summary = f"{lines} line{'' if lines == 1 else 's'} of output"
+        
+        if tool_results.get("truncated"):
+            summary += " (truncated)"
+        return "Done", summary
+    
+    def _format_report(self, results):
+        """Plain-text report covering every tool, as saved to a .txt file"""
+        output = [f"STEGANOGRAPHY ANALYSIS RESULTS\n"]
+        output.append(f"{'='*60}\n\n")
+        output.append(f"File: {results['file_path']}\n")
+        output.append(f"Size: {results['file_size']} bytes\n")
+        output.append(f"Type: {results.get('file_type', 'unknown')}\n\n")
         
         for tool_name, tool_results in results["analysis_results"].items():
-            output += f"[{tool_name.upper()}]\n"
-            output += "-" * 40 + "\n"
-            
-            if "error" in tool_results:
-                output += f"Error: {tool_results['error']}\n\n"
-                continue
-            
-            if not tool_results.get("success", False):
-                output += "No results found\n\n"
-                continue
-            
-            # Display tool-specific results
-            if tool_name == "zsteg" and tool_results.get("output"):
-                output += tool_results["output"] + "\n"
-            
-            elif tool_name == "steghide":
-                if tool_results.get("extracted_content"):
-                    output += "Extracted content:\n"
-                    content = tool_results["extracted_content"]
-                    output += (content[:500] + "..." if len(content) > 500 else content) + "\n"
-                else:
-                    output += "No hidden content extracted\n"
-            
-            elif tool_name == "outguess":
-                if tool_results.get("extracted_content"):
-                    output += "Extracted content:\n"
-                    content = tool_results["extracted_content"]
-                    output += (content[:500] + "..." if len(content) > 500 else content) + "\n"
-                else:
-                    output += "No hidden content extracted\n"
-            
-            elif tool_name == "exiftool":
-                metadata = tool_results.get("metadata", {})
-                if metadata:
-                    for key, value in metadata.items():
-                        output += f"{key}: {value}\n"
-                else:
-                    output += "No metadata found\n"
-            
-            elif tool_name == "binwalk":
-                if tool_results.get("signatures"):
-                    output += tool_results["signatures"] + "\n"
-                else:
-                    output += "No signatures found\n"
-            
-            elif tool_name == "foremost":
-                if tool_results.get("audit"):
-                    output += tool_results["audit"] + "\n"
-                else:
-                    output += "No carved files found\n"
-            
-            elif tool_name == "strings":
-                interesting = tool_results.get("interesting_strings", [])
-                total = tool_results.get("total_strings", 0)
-                if interesting:
-                    output += f"Found {total} strings, showing first 10 interesting ones:\n"
-                    for i, string in enumerate(interesting[:10]):
-                        output += f"  {i+1}: {string}\n"
-                else:
-                    output += "No interesting strings found\n"
-            
-            output += "\n"
+            output.append(f"[{tool_name.upper()}]\n")
+            output.append("-" * 40 + "\n")
+            output.append(self._format_tool(tool_name, tool_results))
+            output.append("\n")
         
-        self.results_text.insert(1.0, output)
+        # Join once instead of re-copying the text on every +=
+        return "".join(output)
+    
+    @staticmethod
+    def _format_tool(tool_name, tool_results):
+        """Full text of one tool's results"""
+        if "error" in tool_results:
+            return f"Error: {tool_results['error']}\n"
+        
+        if not tool_results.get("success", False):
+            return "No results found\n"
+        
+        output = []
+        if tool_results.get("truncated"):
+            output.append("Output truncated; the tool was stopped early\n")
+        
+        # Display tool-specific results
+        if tool_name == "zsteg" and tool_results.get("output"):
+            output.append(tool_results["output"] + "\n")
+        
+        elif tool_name in ("steghide", "outguess"):
+            content = tool_results.get("extracted_content")
+            if content:
+                size = tool_results.get("extracted_size", len(content))
+                output.append(f"Extracted content ({size} bytes):\n")
+                if tool_results.get("extracted_sha256"):
+                    output.append(f"SHA-256: {tool_results['extracted_sha256']}\n")
+                output.append(content[:CONTENT_PREVIEW_LENGTH])
+                output.append("...\n" if len(content) > CONTENT_PREVIEW_LENGTH else "\n")
+            else:
+                output.append("No hidden content extracted\n")
+        
+        elif tool_name == "exiftool":
+            metadata = tool_results.get("metadata", {})
+            if metadata:
+                for key, value in metadata.items():
+                    output.append(f"{key}: {value}\n")
+            else:
+                output.append("No metadata found\n")
+        
+        elif tool_name == "binwalk":
+            if tool_results.get("signatures"):
+                output.append(tool_results["signatures"] + "\n")
+            else:
+                output.append("No signatures found\n")
+        
+        elif tool_name == "foremost":
+            if tool_results.get("audit"):
+                output.append(tool_results["audit"] + "\n")
+            else:
+                output.append("No carved files found\n")
+        
+        elif tool_name == "strings":
+            interesting = tool_results.get("interesting_strings", [])
+            total = tool_results.get("total_strings", 0)
+            if interesting:
+                output.append(f"Found {total} strings, showing first 10 interesting ones:\n")
+                for i, string in enumerate(interesting[:10]):
+                    output.append(f"  {i+1}: {string}\n")
+            else:
+                output.append("No interesting strings found\n")
+        
+        return "".join(output)
+    
+    def _show_text(self, text):
+        """Replace the results text, a slice per event-loop turn so the window stays responsive"""
+        self._cancel_insert()
+        self.results_text.delete(1.0, tk.END)
+        self._insert_slice(text, 0)
+    
+    def _insert_slice(self, text, start):
+        """Append one slice of text and schedule the next"""
+        end = start + INSERT_CHUNK_SIZE
+        self.results_text.insert(tk.END, text[start:end])
+        if end < len(text):
+            # Redraw, then let pending events run before the next slice
+            self.results_text.update_idletasks()
+            self._insert_job = self.root.after_idle(self._insert_slice, text, end)
+        else:
+            self._insert_job = None
+    
+    def _cancel_insert(self):
+        """Stop feeding an earlier result text into the widget"""
+        if self._insert_job is not None:
+            self.root.after_cancel(self._insert_job)
+            self._insert_job = None
     
     def clear_results(self):
         """Clear the results area"""
+        self._reset_results()
+        self.results_frame.config(text="Analysis Results")
+        self._schedule_status("Results cleared")
+    
+    def _reset_results(self):
+        """Empty the results list, detail panel and stored results"""
+        self._cancel_insert()
+        self.results_tree.delete(*self.results_tree.get_children())
         self.results_text.delete(1.0, tk.END)
         self.results = None
-        self.status_var.set("Results cleared")
+        self._tool_results = {}
     
     def save_results(self):
         """Save results to a file"""
@@ -301,16 +525,15 @@ class StegoGUI:
         if filename:
             try:
                 if filename.endswith('.json'):
-                    with open(filename, 'w') as f:
-                        json.dump(self.results, f, indent=2, default=str)
+                    StegoAnalyzer.write_json(self.results, filename, pretty=self.pretty_var.get())
                 else:
-                    # Save as text
-                    content = self.results_text.get(1.0, tk.END)
+                    # Save as text; the detail panel only ever holds one tool
+                    content = self._format_report(self.results)
                     with open(filename, 'w', encoding='utf-8') as f:
                         f.write(content)
                 
                 messagebox.showinfo("Success", f"Results saved to: {filename}")
-                self.status_var.set(f"Results saved to {os.path.basename(filename)}")
+                self._schedule_status(f"Results saved to {os.path.basename(filename)}")
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save results:\n{str(e)}")
@@ -319,7 +542,8 @@ class StegoGUI:
         """Start the GUI application"""
         self.root.mainloop()
         # Cleanup when GUI closes
-        self.analyzer.cleanup()
+        if self.analyzer is not None:
+            self.analyzer.cleanup()
 
 if __name__ == "__main__":
     app = StegoGUI()